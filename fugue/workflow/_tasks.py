@@ -60,8 +60,14 @@ class FugueTask(TaskSpec, ABC):
         self._broadcast = False
         self._checkpoint = False
         self._checkpoint_namespace: Optional[str] = None
+        self._uuid_cache: Optional[str] = None
 
     def __uuid__(self) -> str:
+        if self._uuid_cache is None:
+            self._uuid_cache = self._compute_uuid()
+        return self._uuid_cache
+
+    def _compute_uuid(self) -> str:
         return to_uuid(
             self.configs,
             self.inputs,
@@ -102,25 +108,18 @@ class FugueTask(TaskSpec, ABC):
         # TODO: currently checkpoint is not taking effect
         self._checkpoint = True
         self._checkpoint_namespace = None if namespace is None else str(namespace)
+        self._uuid_cache = None
 
     def persist(self, level: Any) -> "FugueTask":
         self._persist = "" if level is None else level
+        self._uuid_cache = None
         return self
 
-    def handle_persist(self, df: DataFrame, engine: ExecutionEngine) -> DataFrame:
-        if self._persist is None:
-            return df
-        return engine.persist(df, None if self._persist == "" else self._persist)
-
     def broadcast(self) -> "FugueTask":
         self._broadcast = True
+        self._uuid_cache = None
         return self
 
-    def handle_broadcast(self, df: DataFrame, engine: ExecutionEngine) -> DataFrame:
-        if not self._broadcast:
-            return df
-        return engine.broadcast(df)
-
     # def pre_partition(self, *args: Any, **kwargs: Any) -> "FugueTask":
     #    self._pre_partition = PartitionSpec(*args, **kwargs)
     #    return self
@@ -133,8 +132,18 @@ class FugueTask(TaskSpec, ABC):
     def _get_execution_engine(self, ctx: TaskContext) -> ExecutionEngine:
         return self._get_workflow_context(ctx).execution_engine
 
-    def _set_result(self, ctx: TaskContext, df: DataFrame) -> None:
-        self._get_workflow_context(ctx).set_result(id(self), df)
+    def _finalize(
+        self, ctx: TaskContext, wfctx: FugueWorkflowContext, df: DataFrame
+    ) -> None:
+        persist, broadcast = self._persist, self._broadcast
+        if persist is not None or broadcast:
+            e = wfctx.execution_engine
+            if persist is not None:
+                df = e.persist(df, None if persist == "" else persist)
+            if broadcast:
+                df = e.broadcast(df)
+        wfctx.set_result(id(self), df)
+        ctx.outputs["_0"] = df
 
 
 class Create(FugueTask):
@@ -154,18 +163,15 @@ class Create(FugueTask):
         )
 
     @no_type_check
-    def __uuid__(self) -> str:
-        return to_uuid(super().__uuid__(), self._creator, self._creator._params)
+    def _compute_uuid(self) -> str:
+        return to_uuid(super()._compute_uuid(), self._creator, self._creator._params)
 
     @no_type_check
     def execute(self, ctx: TaskContext) -> None:
-        e = self._get_execution_engine(ctx)
-        self._creator._execution_engine = e
+        wfctx = self._get_workflow_context(ctx)
+        self._creator._execution_engine = wfctx.execution_engine
         df = self._creator.create()
-        df = self.handle_persist(df, e)
-        df = self.handle_broadcast(df, e)
-        self._set_result(ctx, df)
-        ctx.outputs["_0"] = df
+        self._finalize(ctx, wfctx, df)
 
 
 class Process(FugueTask):
@@ -194,9 +200,9 @@ class Process(FugueTask):
         )
 
     @no_type_check
-    def __uuid__(self) -> str:
+    def _compute_uuid(self) -> str:
         return to_uuid(
-            super().__uuid__(),
+            super()._compute_uuid(),
             self._processor,
             self._processor._params,
             self._processor._partition_spec,
@@ -204,16 +210,13 @@ class Process(FugueTask):
 
     @no_type_check
     def execute(self, ctx: TaskContext) -> None:
-        e = self._get_execution_engine(ctx)
-        self._processor._execution_engine = e
+        wfctx = self._get_workflow_context(ctx)
+        self._processor._execution_engine = wfctx.execution_engine
         if self._input_has_key:
             df = self._processor.process(DataFrames(ctx.inputs))
         else:
             df = self._processor.process(DataFrames(ctx.inputs.values()))
-        df = self.handle_persist(df, e)
-        df = self.handle_broadcast(df, e)
-        self._set_result(ctx, df)
-        ctx.outputs["_0"] = df
+        self._finalize(ctx, wfctx, df)
 
 
 class Output(FugueTask):
@@ -242,9 +245,9 @@ class Output(FugueTask):
         )
 
     @no_type_check
-    def __uuid__(self) -> str:
+    def _compute_uuid(self) -> str:
         return to_uuid(
-            super().__uuid__(),
+            super()._compute_uuid(),
             self._outputter,
             self._outputter._params,
             self._outputter._partition_spec,
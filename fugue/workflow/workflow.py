@@ -1055,8 +1055,8 @@ class FugueWorkflow(object):
             if len(self._graph.down[v]) > 1 and self.conf.get(
                 "fugue.workflow.auto_persist", False
             ):
-                self._spec.tasks[v]._persist = self.conf.get(
-                    "fugue.workflow.auto_persist_value", ""
+                self._spec.tasks[v].persist(
+                    self.conf.get("fugue.workflow.auto_persist_value", "")
                 )
         return WorkflowDataFrame(self, wt)
 
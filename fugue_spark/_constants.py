@@ -1,3 +1,6 @@
 from typing import Dict, Any
 
-FUGUE_SPARK_DEFAULT_CONF: Dict[str, Any] = {"fugue.spark.use_pandas_udf": False}
+FUGUE_SPARK_DEFAULT_CONF: Dict[str, Any] = {
+    "fugue.spark.use_pandas_udf": False,
+    "fugue.spark.use_arrow_mapper": False,
+}
@@ -1,4 +1,6 @@
 import logging
+from threading import RLock
+from weakref import WeakKeyDictionary
 from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 import pandas as pd
@@ -28,7 +30,7 @@ from fugue_spark._utils.partition import (
     hash_repartition,
     rand_repartition,
 )
-from pyspark import StorageLevel
+from pyspark import StorageLevel, TaskContext
 from pyspark.rdd import RDD
 from pyspark.sql import SparkSession
 from pyspark.sql.functions import PandasUDFType, broadcast, col, pandas_udf
@@ -51,6 +53,16 @@ _TO_SPARK_JOIN_MAP: Dict[str, str] = {
     "leftanti": "left_anti",
 }
 
+# common spellings of join types that need no normalization
+_TO_SPARK_JOIN_MAP_RAW: Dict[str, str] = {
+    **_TO_SPARK_JOIN_MAP,
+    "left_outer": "left_outer",
+    "right_outer": "right_outer",
+    "full_outer": "outer",
+    "left_semi": "left_semi",
+    "left_anti": "left_anti",
+}
+
 
 class SparkSQLEngine(SQLEngine):
     """`Spark SQL <https://spark.apache.org/sql/>`_ execution implementation.
@@ -96,13 +108,11 @@ class SparkExecutionEngine(ExecutionEngine):
         self._fs = FileSystem()
         self._log = logging.getLogger()
         self._default_sql_engine = SparkSQLEngine(self)
-        self._broadcast_func = RunOnce(
-            self._broadcast, lambda *args, **kwargs: id(args[0])
-        )
-        self._persist_func = RunOnce(self._persist, lambda *args, **kwargs: id(args[0]))
-        self._register_func = RunOnce(
-            self._register, lambda *args, **kwargs: id(args[0])
-        )
+        # keyed weakly by the native Spark DataFrame, values must not reference keys
+        self._cache_lock = RLock()
+        self._cache_key_locks: Any = WeakKeyDictionary()
+        self._broadcast_cache: Any = WeakKeyDictionary()
+        self._persist_cache: Any = WeakKeyDictionary()
         self._io = SparkIO(self.spark_session, self.fs)
 
     def __repr__(self) -> str:
@@ -192,12 +202,11 @@ class SparkExecutionEngine(ExecutionEngine):
         return SparkDataFrame(sdf, adf.schema, metadata)
 
     def repartition(self, df: DataFrame, partition_spec: PartitionSpec) -> DataFrame:
-        def _persist_and_count(df: DataFrame) -> int:
-            df = self.persist(df)
-            return df.count()
-
         df = self.to_df(df)
-        num_funcs = {KEYWORD_ROWCOUNT: lambda: _persist_and_count(df)}
+        if partition_spec.algo == "even":
+            df = self.persist(df)
+        # the row count function is only called when num_partitions uses ROWCOUNT
+        num_funcs = {KEYWORD_ROWCOUNT: lambda: self.persist(df).count()}
         num = partition_spec.get_num_partitions(**num_funcs)
 
         if partition_spec.algo == "hash":
@@ -209,7 +218,6 @@ class SparkExecutionEngine(ExecutionEngine):
                 self.spark_session, df.native, num, partition_spec.partition_by
             )
         elif partition_spec.algo == "even":
-            df = self.persist(df)
             sdf = even_repartition(
                 self.spark_session, df.native, num, partition_spec.partition_by
             )
@@ -231,10 +239,11 @@ class SparkExecutionEngine(ExecutionEngine):
         metadata: Any = None,
         on_init: Optional[Callable[[int, DataFrame], Any]] = None,
     ) -> DataFrame:
+        output_schema = Schema(output_schema)
         if (
             self.conf.get_or_throw("fugue.spark.use_pandas_udf", bool)
             and len(partition_spec.partition_by) > 0
-            and not any(pa.types.is_nested(t) for t in Schema(output_schema).types)
+            and not any(pa.types.is_nested(t) for t in output_schema.types)
         ):
             return self._map_by_pandas_udf(
                 df,
@@ -245,18 +254,37 @@ class SparkExecutionEngine(ExecutionEngine):
                 on_init=on_init,
             )
         df = self.to_df(self.repartition(df, partition_spec))
+        if self.conf.get_or_throw(
+            "fugue.spark.use_arrow_mapper", bool
+        ) and _is_arrow_mappable(df, output_schema, partition_spec):
+            arrow_mapper = _ArrowMapper(
+                df, map_func, output_schema, partition_spec, on_init
+            )
+            sdf = df.native.mapInArrow(arrow_mapper.run, to_spark_schema(output_schema))
+            return self.to_df(sdf, output_schema, metadata)
         mapper = _Mapper(df, map_func, output_schema, partition_spec, on_init)
         sdf = df.native.rdd.mapPartitionsWithIndex(mapper.run, True)
         return self.to_df(sdf, output_schema, metadata)
 
     def broadcast(self, df: DataFrame) -> SparkDataFrame:
-        return self._broadcast_func(self.to_df(df))
+        sdf = self.to_df(df)
+        native = self._run_once(
+            self._broadcast_cache, sdf.native, lambda: self._broadcast(sdf).native
+        )
+        return SparkDataFrame(native, sdf.schema, sdf.metadata)
 
     def persist(self, df: DataFrame, level: Any = None) -> SparkDataFrame:
-        return self._persist_func(self.to_df(df), level)
+        sdf = self.to_df(df)
+        self._run_once(
+            self._persist_cache,
+            sdf.native,
+            lambda: self._persist(sdf, level) is not None,
+        )
+        return sdf
 
     def register(self, df: DataFrame, name: str) -> SparkDataFrame:
-        return self._register_func(self.to_df(df), name)
+        # always (re)create the view, the same name may point to another dataframe
+        return self._register(self.to_df(df), name)
 
     def join(
         self,
@@ -267,12 +295,15 @@ class SparkExecutionEngine(ExecutionEngine):
         metadata: Any = None,
     ) -> DataFrame:
         key_schema, output_schema = get_join_schemas(df1, df2, how=how, on=on)
-        how = how.lower().replace("_", "").replace(" ", "")
-        assert_or_throw(
-            how in _TO_SPARK_JOIN_MAP,
-            ValueError(f"{how} is not supported as a join type"),
-        )
-        how = _TO_SPARK_JOIN_MAP[how]
+        if how in _TO_SPARK_JOIN_MAP_RAW:
+            how = _TO_SPARK_JOIN_MAP_RAW[how]
+        else:
+            how = how.lower().replace("_", "").replace(" ", "")
+            assert_or_throw(
+                how in _TO_SPARK_JOIN_MAP,
+                ValueError(f"{how} is not supported as a join type"),
+            )
+            how = _TO_SPARK_JOIN_MAP[how]
         d1 = self.to_df(df1).native
         d2 = self.to_df(df2).native
         cols = [col(n) for n in output_schema.names]
@@ -314,6 +345,21 @@ class SparkExecutionEngine(ExecutionEngine):
             **kwargs,
         )
 
+    def _run_once(self, cache: Any, key: ps.DataFrame, func: Callable[[], Any]) -> Any:
+        res = cache.get(key)
+        if res is not None:
+            return res
+        with self._cache_lock:
+            lock = self._cache_key_locks.get(key)
+            if lock is None:
+                lock = self._cache_key_locks[key] = RLock()
+        with lock:  # only blocks callers working on the same dataframe
+            res = cache.get(key)
+            if res is None:
+                res = func()
+                cache[key] = res
+            return res
+
     def _broadcast(self, df: SparkDataFrame) -> SparkDataFrame:
         sdf = broadcast(df.native)
         return SparkDataFrame(sdf, df.schema, df.metadata)
@@ -337,7 +383,7 @@ class SparkExecutionEngine(ExecutionEngine):
         self,
         df: DataFrame,
         map_func: Callable[[PartitionCursor, LocalDataFrame], LocalDataFrame],
-        output_schema: Any,
+        output_schema: Schema,
         partition_spec: PartitionSpec,
         metadata: Any = None,
         on_init: Optional[Callable[[int, DataFrame], Any]] = None,
@@ -345,7 +391,7 @@ class SparkExecutionEngine(ExecutionEngine):
         presort = partition_spec.presort
         presort_keys = list(presort.keys())
         presort_asc = list(presort.values())
-        output_schema = Schema(output_schema)
+        spark_schema = to_spark_schema(output_schema)
         input_schema = df.schema
         on_init_once: Any = (
             None
@@ -359,10 +405,10 @@ class SparkExecutionEngine(ExecutionEngine):
             if pdf.shape[0] == 0:
                 return PandasDataFrame([], output_schema).as_pandas()
             if len(presort_keys) > 0:
-                pdf = pdf.sort_values(presort_keys, ascending=presort_asc)
-            input_df = PandasDataFrame(
-                pdf.reset_index(drop=True), input_schema, pandas_df_wrapper=True
-            )
+                pdf = pdf.sort_values(
+                    presort_keys, ascending=presort_asc, ignore_index=True
+                )
+            input_df = PandasDataFrame(pdf, input_schema, pandas_df_wrapper=True)
             if on_init_once is not None:
                 on_init_once(0, input_df)
             cursor = partition_spec.get_cursor(input_schema, 0)
@@ -371,31 +417,46 @@ class SparkExecutionEngine(ExecutionEngine):
             return output_df.as_pandas()
 
         df = self.to_df(df)
-        udf = pandas_udf(
-            _udf, to_spark_schema(output_schema), PandasUDFType.GROUPED_MAP
-        )
-        sdf = df.native.groupBy(*partition_spec.partition_by).apply(udf)
+        gdf = df.native.groupBy(*partition_spec.partition_by)
+        if hasattr(gdf, "applyInPandas"):  # Spark 3+
+            sdf = gdf.applyInPandas(_udf, schema=spark_schema)
+        else:  # pragma: no cover
+            udf = pandas_udf(_udf, spark_schema, PandasUDFType.GROUPED_MAP)
+            sdf = gdf.apply(udf)
         return SparkDataFrame(sdf, metadata=metadata)
 
 
-class _Mapper(object):  # pragma: no cover
-    # pytest can't identify the coverage, but this part is fully tested
+class _MapperBase(object):  # pragma: no cover
+    __slots__ = (
+        "schema",
+        "output_schema",
+        "metadata",
+        "partition_spec",
+        "map_func",
+        "on_init",
+    )
+
     def __init__(
         self,
         df: DataFrame,
         map_func: Callable[[PartitionCursor, LocalDataFrame], LocalDataFrame],
-        output_schema: Any,
+        output_schema: Schema,
         partition_spec: PartitionSpec,
         on_init: Optional[Callable[[int, DataFrame], Any]],
     ):
         super().__init__()
         self.schema = df.schema
-        self.output_schema = Schema(output_schema)
+        self.output_schema = output_schema
         self.metadata = df.metadata
         self.partition_spec = partition_spec
         self.map_func = map_func
         self.on_init = on_init
 
+
+class _Mapper(_MapperBase):  # pragma: no cover
+    # pytest can't identify the coverage, but this part is fully tested
+    __slots__ = ()
+
     def run(self, no: int, rows: Iterable[ps.Row]) -> Iterable[Any]:
         df = IterableDataFrame(
             to_type_safe_input(rows, self.schema), self.schema, self.metadata
@@ -417,5 +478,49 @@ class _Mapper(object):  # pragma: no cover
             sub_df = IterableDataFrame(sub, self.schema)
             sub_df._metadata = self.metadata
             res = self.map_func(cursor, sub_df)
-            for r in res.as_array_iterable(type_safe=True):
-                yield r
+            yield from res.as_array_iterable(type_safe=True)
+
+
+class _ArrowMapper(_MapperBase):  # pragma: no cover
+    # only used with Spark 3.3+, see _is_arrow_mappable
+    __slots__ = ()
+
+    def run(self, batches: Iterable[pa.RecordBatch]) -> Iterable[pa.RecordBatch]:
+        batches = list(batches)
+        if len(batches) == 0:
+            return
+        table = pa.Table.from_batches(batches)
+        if table.num_rows == 0:
+            return
+        if table.schema != self.schema.pa_schema:
+            table = table.cast(self.schema.pa_schema)
+        df = ArrowDataFrame(table, metadata=self.metadata)
+        no = TaskContext.get().partitionId()
+        cursor = self.partition_spec.get_cursor(self.schema, no)
+        if self.on_init is not None:
+            self.on_init(no, df)
+        cursor.set(df.peek_array(), 0, 0)
+        res = self.map_func(cursor, df).as_arrow(type_safe=True)
+        if res.schema != self.output_schema.pa_schema:
+            res = res.cast(self.output_schema.pa_schema)
+        yield from res.to_batches()
+
+
+def _is_arrow_mappable(
+    df: SparkDataFrame, output_schema: Schema, partition_spec: PartitionSpec
+) -> bool:
+    # mapInArrow is only available in Spark 3.3+, and each physical partition
+    # must map to exactly one logical partition
+    if not hasattr(df.native, "mapInArrow"):
+        return False
+    spec = partition_spec.jsondict
+    if (
+        len(partition_spec.partition_by) > 0
+        or spec["row_limit"] > 0
+        or spec["size_limit"] > 0
+    ):
+        return False
+    return not any(
+        pa.types.is_nested(t) or pa.types.is_temporal(t)
+        for t in list(df.schema.types) + list(output_schema.types)
+    )
@@ -1,11 +1,21 @@
-from typing import Iterable, List, Tuple
+from functools import lru_cache
+from io import StringIO
+from typing import Dict, List, Tuple
 
-from antlr4 import CommonTokenStream, InputStream
+from antlr4 import CommonTokenStream, InputStream, PredictionMode
+from antlr4.error.Errors import ParseCancellationException
 from antlr4.error.ErrorListener import ErrorListener
+from antlr4.error.ErrorStrategy import BailErrorStrategy, DefaultErrorStrategy
 from antlr4.tree.Tree import TerminalNode, Token, Tree
 from fugue_sql._antlr import FugueSQLLexer, FugueSQLParser
 from fugue_sql.exceptions import FugueSQLSyntaxError
 
+_KEYWORDS: Dict[str, int] = {
+    k: getattr(FugueSQLParser, k)
+    for k in dir(FugueSQLParser)
+    if k.isupper() and type(getattr(FugueSQLParser, k)) is int
+}
+
 
 class FugueSQL(object):
     def __init__(
@@ -18,7 +28,17 @@ class FugueSQL(object):
     ):
         self._rule = rule
         self._raw_code = code
-        if ignore_case:
+        if ignore_case and code.upper() == code:
+            # all keywords are already upper cased, no need to rebuild the code
+            self._code = code
+            self._tree = _to_tree(
+                self._code,
+                self._rule,
+                True,
+                simple_assign=simple_assign,
+                ansi_sql=ansi_sql,
+            )
+        elif ignore_case:
             self._code, self._tree = _to_cased_code(
                 code, rule, simple_assign=simple_assign, ansi_sql=ansi_sql
             )
@@ -45,21 +65,54 @@ class FugueSQL(object):
         return self._tree
 
 
+# cached trees keep their parser and token stream alive, so only small scripts
+# are cached, and only a few of them
+_PARSE_CACHE_SIZE = 32
+_PARSE_CACHE_MAX_CODE_LEN = 4096
+
+
 def _to_tree(
     code: str, rule: str, all_upper_case: bool, simple_assign: bool, ansi_sql: bool
+) -> Tree:
+    if len(code) > _PARSE_CACHE_MAX_CODE_LEN:
+        return _parse(code, rule, all_upper_case, simple_assign, ansi_sql)
+    return _parse_cached(code, rule, all_upper_case, simple_assign, ansi_sql)
+
+
+@lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _parse_cached(
+    code: str, rule: str, all_upper_case: bool, simple_assign: bool, ansi_sql: bool
+) -> Tree:
+    return _parse(code, rule, all_upper_case, simple_assign, ansi_sql)
+
+
+def _parse(
+    code: str, rule: str, all_upper_case: bool, simple_assign: bool, ansi_sql: bool
 ) -> Tree:
     input_stream = InputStream(code)
     lexer = FugueSQLLexer(input_stream)
     lexer._all_upper_case = all_upper_case
     lexer._ansi_sql = ansi_sql
     lexer._simple_assign = simple_assign
+    lexer.removeErrorListeners()
     stream = CommonTokenStream(lexer)
     parser = FugueSQLParser(stream)
     parser._all_upper_case = all_upper_case
     parser._simple_assign = simple_assign
     parser._ansi_sql = ansi_sql
-    parser.addErrorListener(_ErrorListener(code.splitlines()))
-    return getattr(parser, rule)()  # validate syntax
+    # two stage parsing: the fast SLL mode works for most inputs, only when it
+    # fails, fall back to the full LL mode which also reports syntax errors
+    parser.removeErrorListeners()
+    parser._errHandler = BailErrorStrategy()
+    parser._interp.predictionMode = PredictionMode.SLL
+    try:
+        return getattr(parser, rule)()
+    except ParseCancellationException:
+        parser.reset()
+        parser._errHandler = DefaultErrorStrategy()
+        parser._interp.predictionMode = PredictionMode.LL
+        parser.addErrorListener(_ErrorListener(code.splitlines()))
+        return getattr(parser, rule)()  # validate syntax
 
 
 def _to_cased_code(
@@ -68,32 +121,30 @@ def _to_cased_code(
     tree = _to_tree(
         code.upper(), rule, True, simple_assign=simple_assign, ansi_sql=ansi_sql
     )
-    tokens = [t for t in _to_tokens(tree) if _is_keyword(t)]
+    tokens = [t for t in _to_tokens(tree) if _KEYWORDS.get(t.text) == t.type]
     start = 0
-    cased_code: List[str] = []
+    cased_code = StringIO()
     for t in tokens:
         if t.start > start:
-            cased_code.append(code[start : t.start])
-        cased_code.append(code[t.start : t.stop + 1].upper())
+            cased_code.write(code[start : t.start])
+        cased_code.write(code[t.start : t.stop + 1].upper())
         start = t.stop + 1
     if start < len(code):
-        cased_code.append(code[start:])
-    return "".join(cased_code), tree
-
+        cased_code.write(code[start:])
+    return cased_code.getvalue(), tree
 
-def _to_tokens(node: Tree) -> Iterable[Token]:
-    if isinstance(node, TerminalNode):
-        yield node.getSymbol()
-    else:
-        for i in range(node.getChildCount()):
-            for x in _to_tokens(node.getChild(i)):
-                yield x
 
-
-def _is_keyword(token: Token):
-    if not hasattr(FugueSQLParser, token.text):
-        return False
-    return getattr(FugueSQLParser, token.text) == token.type
+def _to_tokens(node: Tree) -> List[Token]:
+    stack: List[Tree] = [node]
+    tokens: List[Token] = []
+    while len(stack) > 0:
+        n = stack.pop()
+        if isinstance(n, TerminalNode):
+            tokens.append(n.getSymbol())
+        else:
+            for i in range(n.getChildCount() - 1, -1, -1):
+                stack.append(n.getChild(i))
+    return tokens
 
 
 class _ErrorListener(ErrorListener):
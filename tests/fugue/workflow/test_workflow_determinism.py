@@ -32,6 +32,40 @@ def test_checkpoint():
     assert id2 == id3
 
 
+def test_uuid_invalidation():
+    dag = FugueWorkflow()
+    df = dag.df([[0]], "a:int32")
+    id0 = dag.spec_uuid()
+    assert id0 == dag.spec_uuid()
+    df.persist()
+    id1 = dag.spec_uuid()
+    df.broadcast()
+    id2 = dag.spec_uuid()
+    df.checkpoint()
+    id3 = dag.spec_uuid()
+
+    assert len({id0, id1, id2, id3}) == 4
+
+
+def test_auto_persist_uuid_mid_build():
+    dag1 = FugueWorkflow(NativeExecutionEngine(
+        {"fugue.workflow.auto_persist": True}))
+    df1 = dag1.df([[0]], "a:int")
+    df1.show()
+    df1.show()
+    id1 = dag1.spec_uuid()
+
+    dag2 = FugueWorkflow(NativeExecutionEngine(
+        {"fugue.workflow.auto_persist": True}))
+    df1 = dag2.df([[0]], "a:int")
+    dag2.spec_uuid()
+    df1.show()
+    df1.show()
+    id2 = dag2.spec_uuid()
+
+    assert id1 == id2
+
+
 def test_auto_persist():
     dag1 = FugueWorkflow(NativeExecutionEngine())
     df1 = dag1.df([[0]], "a:int")
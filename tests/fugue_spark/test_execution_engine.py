@@ -1,11 +1,15 @@
 from typing import Any, Iterable, List
 
+import pyspark.sql as ps
 import pytest
 from fugue.collections.partition import PartitionSpec
+from fugue.dataframe import DataFrames
 from fugue.dataframe.array_dataframe import ArrayDataFrame
+from fugue.dataframe.arrow_dataframe import ArrowDataFrame
 from fugue.extensions._builtins.outputters import df_eq
 from fugue.extensions.transformer import Transformer, transformer
 from fugue.workflow.workflow import FugueWorkflow
+from fugue_spark.dataframe import SparkDataFrame
 from fugue_spark.execution_engine import SparkExecutionEngine
 from fugue_test.builtin_suite import BuiltInTests
 from fugue_test.execution_suite import ExecutionEngineTests
@@ -38,6 +42,9 @@ class SparkExecutionEngineTests(ExecutionEngineTests.Tests):
         df_eq(a, o, throw=True)
         a = e.to_df([[1, None]], "a:int,b:int", dict(a=1))
         df_eq(a, [[1, None]], "a:int,b:int", dict(a=1), throw=True)
+        o = ArrowDataFrame([[1, None], [2, 3]], "a:int,b:int", dict(a=1))
+        a = e.to_df(o)
+        df_eq(a, o, throw=True)
 
     def test_persist(self):
         e = self.engine
@@ -55,6 +62,53 @@ class SparkExecutionEngineTests(ExecutionEngineTests.Tests):
         e.persist(a, "xyz")
         raises(ValueError, lambda: e.persist(o, "xyz"))
 
+    def test_persist_broadcast_metadata(self):
+        e = self.engine
+        o = e.to_df(ArrayDataFrame([[1, 2]], "a:int,b:int"))
+        a1 = SparkDataFrame(o.native, metadata=dict(a=1))
+        a2 = SparkDataFrame(o.native, metadata=dict(a=2))
+        assert a1 is e.persist(a1)
+        assert a2 is e.persist(a2)
+        b1 = e.broadcast(a1)
+        b2 = e.broadcast(a2)
+        assert b1.native is b2.native
+        assert 1 == b1.metadata["a"]
+        assert 2 == b2.metadata["a"]
+        df_eq(b2, o, throw=True)
+
+    def test_repartition_rowcount(self, mocker):
+        e = self.engine
+        o = e.to_df(ArrayDataFrame([[1, 2], [3, 4]], "a:int,b:int"))
+        spy = mocker.spy(type(o.native), "count")
+        a = e.repartition(o, PartitionSpec(algo="hash", num="ROWCOUNT"))
+        assert 1 == spy.call_count
+        df_eq(a, o, throw=True)
+
+    def test_register(self):
+        e = self.engine
+        o = ArrayDataFrame([[1, 2]], "a:int,b:int")
+        a = e.register(o, "x")
+        assert a is e.register(a, "x")
+        e.register(a, "y")
+        df_eq(e.to_df(e.spark_session.sql("SELECT * FROM y")), o, throw=True)
+        o2 = ArrayDataFrame([[3, 4]], "a:int,b:int")
+        e.register(o2, "x")
+        df_eq(e.to_df(e.spark_session.sql("SELECT * FROM x")), o2, throw=True)
+        e.register(a, "x")
+        df_eq(e.to_df(e.spark_session.sql("SELECT * FROM x")), o, throw=True)
+
+    def test_select_same_name(self):
+        e = self.engine
+        o1 = ArrayDataFrame([[1, 2]], "a:int,b:int")
+        o2 = ArrayDataFrame([[3, 4]], "a:int,b:int")
+        sql = e.default_sql_engine
+        a = sql.select(DataFrames(x=o1), "SELECT * FROM x")
+        df_eq(a, o1, throw=True)
+        a = sql.select(DataFrames(x=o2), "SELECT * FROM x")
+        df_eq(a, o2, throw=True)
+        a = sql.select(DataFrames(x=o1), "SELECT * FROM x")
+        df_eq(a, o1, throw=True)
+
 
 class SparkExecutionEnginePandasUDFTests(ExecutionEngineTests.Tests):
     @pytest.fixture(autouse=True)
@@ -74,6 +128,37 @@ class SparkExecutionEnginePandasUDFTests(ExecutionEngineTests.Tests):
         return
 
 
+@pytest.mark.skipif(
+    not hasattr(ps.DataFrame, "mapInArrow"), reason="requires Spark 3.3+"
+)
+class SparkExecutionEngineArrowMapperTests(ExecutionEngineTests.Tests):
+    @pytest.fixture(autouse=True)
+    def init_session(self, spark_session):
+        self.spark_session = spark_session
+
+    def make_engine(self):
+        session = SparkSession.builder.getOrCreate()
+        e = SparkExecutionEngine(
+            session,
+            {"test": True,
+             "fugue.spark.use_arrow_mapper": True})
+        assert e.conf.get_or_throw("fugue.spark.use_arrow_mapper", bool)
+        return e
+
+    def test__join_outer_pandas_incompatible(self):
+        return
+
+    def test_map_with_arrow(self):
+        def select_top(cursor, data):
+            assert isinstance(data, ArrowDataFrame)
+            return ArrayDataFrame([cursor.row], cursor.row_schema)
+
+        e = self.engine
+        o = ArrayDataFrame([[1, 2], [3, 4]], "a:int,b:int")
+        c = e.map(o, select_top, o.schema, PartitionSpec(num=1))
+        df_eq(c, [[1, 2]], "a:int,b:int", throw=True)
+
+
 class SparkExecutionEngineBuiltInTests(BuiltInTests.Tests):
     @pytest.fixture(autouse=True)
     def init_session(self, spark_session):
@@ -29,6 +29,35 @@ def test_assign_syntax():
         simple_assign=True)
 
 
+def test_parse_cache():
+    t1 = FugueSQL("a = select a", "fugueLanguage", ignore_case=True).tree
+    t2 = FugueSQL("a = select a", "fugueLanguage", ignore_case=True).tree
+    t3 = FugueSQL("a = select b", "fugueLanguage", ignore_case=True).tree
+    assert t1 is t2
+    assert t1 is not t3
+    # parse options are part of the cache key
+    t4 = FugueSQL(
+        "a = select a", "fugueLanguage", ignore_case=True, ansi_sql=True).tree
+    t5 = FugueSQL(
+        "select a", "fugueLanguage", ignore_case=True, simple_assign=True).tree
+    t6 = FugueSQL(
+        "select a", "fugueLanguage", ignore_case=True, simple_assign=False).tree
+    assert t1 is not t4
+    assert t5 is not t6
+    # large scripts are not cached
+    code = "a = select a\n" * 400
+    t7 = FugueSQL(code, "fugueLanguage", ignore_case=True).tree
+    t8 = FugueSQL(code, "fugueLanguage", ignore_case=True).tree
+    assert t7 is not t8
+
+
+def test_cased_code():
+    s = FugueSQL("a = select a", "fugueLanguage", ignore_case=True)
+    assert "a = SELECT a" == s.code
+    s = FugueSQL("A = SELECT A", "fugueLanguage", ignore_case=True)
+    assert "A = SELECT A" == s.code
+
+
 def test_partition_syntax():
     good_single_syntax(
         "a = ", ["", "hash", "even", "rand"], "  prepartition 100 ", " select a",